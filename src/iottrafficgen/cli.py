@@ -2,12 +2,12 @@
 import sys
 from pathlib import Path
 import click
-import yaml
 from colorama import Fore, Style, init
 
 from . import __version__
 from .core import run_scenario
 from .interactive import interactive_mode, detect_and_configure_placeholders
+from .utils import safe_load, scan_scenario_files
 
 # Initialize colorama
 init(autoreset=True)
@@ -223,18 +223,17 @@ def list_scenarios(workspace: Path, category: str, count_only: bool):
             continue
         
         scenarios = []
-        for yaml_file in sorted(category_dir.glob("*.yaml")):
+        for yaml_file in scan_scenario_files(category_dir):
             try:
-                with open(yaml_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    if data and 'scenario' in data:
-                        name = data['scenario'].get('name', 'Unknown')
-                        description = data['scenario'].get('description', 'No description')
-                        scenarios.append({
-                            'file': yaml_file,
-                            'name': name,
-                            'description': description
-                        })
+                data = safe_load(yaml_file.read_bytes())
+                if data and 'scenario' in data:
+                    name = data['scenario'].get('name', 'Unknown')
+                    description = data['scenario'].get('description', 'No description')
+                    scenarios.append({
+                        'file': yaml_file,
+                        'name': name,
+                        'description': description
+                    })
             except Exception:
                 # Skip files that can't be read
                 continue
@@ -1,8 +1,10 @@
 """
 Core execution logic
 """
+import atexit
 import fcntl
 import json
+import logging
 import os
 import re
 import signal
@@ -41,6 +43,9 @@ NOISE_PATTERNS = [
     r'^\s*$',
 ]
 
+# Seconds a script gets to exit after each shutdown signal before escalating
+GRACEFUL_SHUTDOWN_TIMEOUT = 10
+
 def should_filter_line(line: str) -> bool:
     """Check if a line should be filtered from output."""
     for pattern in NOISE_PATTERNS:
@@ -49,6 +54,44 @@ def should_filter_line(line: str) -> bool:
     return False
 
 
+def stop_process(
+    proc: subprocess.Popen,
+    timeout: float = GRACEFUL_SHUTDOWN_TIMEOUT,
+) -> None:
+    """
+    Stop a script process, escalating SIGTERM then SIGKILL.
+    
+    The caller is expected to have already sent SIGINT; the process gets
+    `timeout` seconds to exit after each signal before the next one is sent,
+    so attack tools spawned by the script are not left generating traffic.
+    
+    Args:
+        proc: Running script process
+        timeout: Grace period in seconds per signal
+    """
+    logger = get_logger()
+    
+    try:
+        proc.wait(timeout=timeout)
+        return
+    except subprocess.TimeoutExpired:
+        logger.warning("Script did not respond to SIGINT, sending SIGTERM")
+        proc.terminate()
+    
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        logger.warning("Script did not respond to SIGTERM, forcing termination")
+        proc.kill()
+        proc.wait()
+
+
+def _kill_orphan(proc: subprocess.Popen) -> None:
+    """atexit hook: kill a script process left running by an abnormal exit."""
+    if proc.poll() is None:
+        proc.kill()
+
+
 def get_script_command(script_path: Path) -> list[str]:
     """
     Determine the appropriate command to execute a script based on its extension.
@@ -80,7 +123,7 @@ def load_scenario(scenario_path: Path) -> Scenario:
         Validated Scenario object
     """
     logger = get_logger()
-    logger.debug(f"Loading scenario: {scenario_path}")
+    logger.debug("Loading scenario: %s", scenario_path)
     
     data = load_yaml_file(scenario_path)
     validate_scenario_schema(data)
@@ -100,12 +143,12 @@ def load_profile(profile_path: Path) -> Profile:
         Profile object
     """
     logger = get_logger()
-    logger.debug(f"Loading profile: {profile_path}")
+    logger.debug("Loading profile: %s", profile_path)
     
-    if not profile_path.exists():
+    try:
+        data = load_yaml_file(profile_path)
+    except FileNotFoundError:
         raise ProfileNotFoundError(profile_path)
-    
-    data = load_yaml_file(profile_path)
     return Profile.from_yaml(data)
 
 
@@ -130,7 +173,7 @@ def execute_run(
         RunResult with execution details
     """
     logger = get_logger()
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
     run_id_unique = f"{run.id}_{timestamp}"
     
     logger.info(f"Preparing run: {run_id_unique}")
@@ -154,14 +197,15 @@ def execute_run(
         raise PlaceholderNotConfiguredError(placeholders, run.script)
     
     validate_script_executable(run.script)
+    script_str = str(run.script)
     
     if run.profile:
         profile = load_profile(run.profile)
         env["TOOL_ARGS"] = profile.tool_args
         click.echo(f"    → Profile: {run.profile.name} ({profile.name})")
-        logger.debug(f"Loaded profile: {profile.name}")
+        logger.debug("Loaded profile: %s", profile.name)
     
-    click.echo(f"    → Script: {run.script}")
+    click.echo(f"    → Script: {script_str}")
     click.echo(f"    → Run ID: {run_id_unique}")
     if dry_run:
         click.echo(f"    → Output dir (not created in dry run): {outputs_dir}")
@@ -173,7 +217,8 @@ def execute_run(
     if "TOOL_ARGS" in env:
         click.echo(f"    → Tool args: {env['TOOL_ARGS']}")
     
-    logger.debug(f"Environment variables: {json.dumps(env, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Environment variables: %s", json.dumps(env, indent=2))
     
     is_benign = run.run_type == "benign"
     start_event = "BENIGN_START" if is_benign else "ATTACK_START"
@@ -200,7 +245,7 @@ def execute_run(
     start_time_str = get_timestamp_utc()
     
     if dry_run:
-        click.echo(f"    → [DRY RUN] Would execute: {run.script}")
+        click.echo(f"    → [DRY RUN] Would execute: {script_str}")
         click.echo("    → [DRY RUN] No files, metadata, or markers will be created")
         logger.info("[DRY RUN] Skipping execution")
         returncode = 0
@@ -225,12 +270,11 @@ def execute_run(
             click.echo(f"    Executing... (Press Ctrl+C to stop)")
         click.echo()
         
-        logger.info(f"Executing script: {run.script}")
+        logger.info(f"Executing script: {script_str}")
         
-        script_path = Path(run.script)
-        cmd = get_script_command(script_path)
+        cmd = get_script_command(run.script)
         
-        logger.debug(f"Command: {' '.join(cmd)}")
+        logger.debug("Command: %s", " ".join(cmd))
         
         proc = subprocess.Popen(
             cmd,
@@ -255,6 +299,7 @@ def execute_run(
         
         # Register signal handler
         old_handler = signal.signal(signal.SIGINT, handle_sigint)
+        atexit.register(_kill_orphan, proc)
         
         try:
             if has_duration:
@@ -298,13 +343,8 @@ def execute_run(
                 if not user_interrupted and proc.poll() is None:
                     logger.info("Duration expired, sending SIGINT for graceful shutdown...")
                     proc.send_signal(signal.SIGINT)
-                    try:
-                        proc.wait(timeout=10)
-                        logger.info("Script completed graceful shutdown")
-                    except subprocess.TimeoutExpired:
-                        logger.warning("Script did not respond to SIGINT, forcing termination")
-                        proc.kill()
-                        proc.wait()
+                    stop_process(proc)
+                    logger.info("Script shutdown completed")
             else:
                 # No duration - run until user stops or script finishes
                 while proc.poll() is None:
@@ -327,12 +367,7 @@ def execute_run(
             
             # Wait for process to finish gracefully
             if proc.poll() is None:
-                try:
-                    proc.wait(timeout=10)
-                except subprocess.TimeoutExpired:
-                    logger.warning("Script did not finish in time, forcing termination")
-                    proc.kill()
-                    proc.wait()
+                stop_process(proc)
             
             if proc.stdout:
                 try:
@@ -347,6 +382,12 @@ def execute_run(
                     pass
             
         finally:
+            # Never leave the script running if we bail out on an exception
+            if proc.poll() is None:
+                logger.warning("Aborting run, stopping script")
+                proc.send_signal(signal.SIGINT)
+                stop_process(proc)
+            atexit.unregister(_kill_orphan)
             # Restore original signal handler
             signal.signal(signal.SIGINT, old_handler)
         
@@ -361,7 +402,7 @@ def execute_run(
         else:
             returncode = proc.returncode if proc.returncode is not None else 0
         
-        logger.debug(f"Script exit code: {returncode}")
+        logger.debug("Script exit code: %s", returncode)
         
         if returncode != 0:
             logger.warning(f"Script failed with exit code {returncode}")
@@ -414,6 +455,7 @@ def save_run_metadata(run: Run, result: RunResult, run_dir: Path) -> None:
     and protocol information from environment variables.
     """
     logger = get_logger()
+    script_str = str(run.script)
     
     metadata = {
         "tool": "iottrafficgen",
@@ -422,7 +464,7 @@ def save_run_metadata(run: Run, result: RunResult, run_dir: Path) -> None:
         "run_id_base": run.id,
         "type": run.run_type,
         "label": run.label,
-        "script": str(run.script),
+        "script": script_str,
         "profile": str(run.profile) if run.profile else None,
         "start_time_utc": result.start_time_utc,
         "end_time_utc": result.end_time_utc,
@@ -460,7 +502,7 @@ def save_run_metadata(run: Run, result: RunResult, run_dir: Path) -> None:
         if "DB_HOST" in env:
             benign_config["infrastructure"]["database"] = env["DB_HOST"]
         
-        script_name = str(run.script).lower()
+        script_name = script_str.lower()
         
         if "mqtt" in script_name or "BROKER_IP" in env:
             benign_config["protocols"].append("mqtt")
@@ -468,7 +510,7 @@ def save_run_metadata(run: Run, result: RunResult, run_dir: Path) -> None:
         if "http" in script_name or "WEB_SERVER_IP" in env:
             benign_config["protocols"].append("http")
         
-        if "udp" in script_name or "swarm" in script_name.lower() or "device" in script_name.lower():
+        if "udp" in script_name or "swarm" in script_name or "device" in script_name:
             benign_config["protocols"].append("udp")
         
         metadata["benign_config"] = benign_config
@@ -478,7 +520,7 @@ def save_run_metadata(run: Run, result: RunResult, run_dir: Path) -> None:
         json.dump(metadata, f, indent=2, ensure_ascii=False)
     
     click.echo(f"    → Metadata: {metadata_file}")
-    logger.debug(f"Saved metadata: {metadata_file}")
+    logger.debug("Saved metadata: %s", metadata_file)
 
 
 def save_scenario_metadata(
@@ -512,7 +554,7 @@ def save_scenario_metadata(
     runs_dir = workspace / "runs"
     runs_dir.mkdir(parents=True, exist_ok=True)
     
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
     metadata_file = runs_dir / f"scenario_metadata_{timestamp}.json"
     with open(metadata_file, "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2, ensure_ascii=False)
@@ -537,6 +579,7 @@ def run_scenario(
     
     click.echo(f"Loading scenario: {scenario_path}")
     
+    marker_system = None
     try:
         scenario_data = load_yaml_file(scenario_path)
         validate_scenario_schema(scenario_data)
@@ -606,4 +649,8 @@ def run_scenario(
     
     except Exception as e:
         logger.exception(f"Unexpected error: {e}")
-        raise
\ No newline at end of file
+        raise
+    
+    finally:
+        if marker_system is not None:
+            marker_system.close()
\ No newline at end of file
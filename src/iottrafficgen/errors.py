@@ -1,10 +1,18 @@
 """
 Error handling
 """
+import errno
+import os
+import shutil
+import stat
 from pathlib import Path
 from typing import Optional
 import click
 
+# errno values for which Path.exists() answers False: nothing reachable at
+# the path (missing, a file used as a directory, or a symlink loop)
+MISSING_PATH_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.ELOOP})
+
 
 class IoTTrafficGenError(Exception):
     """Base exception for iottrafficgen errors."""
@@ -104,7 +112,6 @@ def check_tool_installed(tool: str) -> bool:
     Returns:
         True if installed, False otherwise
     """
-    import shutil
     return shutil.which(tool) is not None
 
 
@@ -119,14 +126,18 @@ def validate_script_executable(script: Path) -> None:
         ScriptNotFoundError: If script doesn't exist
         ScriptNotExecutableError: If script is not executable
     """
-    if not script.exists():
+    # A single stat covers both the existence and the regular-file checks
+    try:
+        st = os.stat(script)
+    except OSError as e:
+        if e.errno not in MISSING_PATH_ERRNOS:
+            raise
         raise ScriptNotFoundError(script)
     
-    if not script.is_file():
+    if not stat.S_ISREG(st.st_mode):
         raise IoTTrafficGenError(f"Script path is not a file: {script}")
     
     # Check if executable (Unix-like systems)
-    import os
     if not os.access(script, os.X_OK):
         raise ScriptNotExecutableError(script)
 
@@ -1,13 +1,18 @@
 """
 Interactive menu for iottrafficgen
 """
+import copy
+import os
 import sys
+import tempfile
+import textwrap
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-import yaml
 from colorama import Fore, Style, init
 
 from . import __version__
+from .utils import load_yaml_file, safe_dump, scan_scenario_files
 
 init(autoreset=True)
 
@@ -24,56 +29,141 @@ BANNER = f"""{Fore.CYAN}  ══════════════════
   ═══════════════════════════════════════════════════════{Style.RESET_ALL}
 """
 
-CATEGORIES = {
-    "1": {
-        "name": "NMAP Reconnaissance",
-        "path": "scenarios/nmap",
-        "count": 30,
-        "description": "Network scanning and host discovery"
-    },
-    "2": {
-        "name": "SSH Brute Force",
-        "path": "scenarios/bruteforce",
-        "count": 6,
-        "description": "SSH credential attacks"
-    },
-    "3": {
-        "name": "SQL Injection",
-        "path": "scenarios/sqli",
-        "count": 6,
-        "description": "Database exploitation attacks"
-    },
-    "4": {
-        "name": "Denial of Service",
-        "path": "scenarios/denial_of_service",
-        "count": 17,
-        "description": "DoS and DDoS attacks"
-    },
-    "5": {
-        "name": "ARP Spoofing",
-        "path": "scenarios/mitm",
-        "count": 1,
-        "description": "Man-in-the-Middle attacks"
-    },
-    "6": {
-        "name": "MQTT Injection",
-        "path": "scenarios/mqtt_inj",
-        "count": 2,
-        "description": "False data injection"
-    },
-    "7": {
-        "name": "DNS Beaconing",
-        "path": "scenarios/dns_beacon",
-        "count": 1,
-        "description": "C2 communication simulation"
-    },
-    "8": {
-        "name": "Benign Traffic",
-        "path": "scenarios/benign",
-        "count": 3,
-        "description": "IoT baseline traffic generation"
-    }
-}
+
+@dataclass(frozen=True, slots=True)
+class Category:
+    """A scenario category shown in the main menu"""
+    name: str
+    path: str
+    count: int
+    description: str
+
+
+# Main menu entries; menu choice N selects CATEGORIES[N - 1]
+CATEGORIES: Tuple[Category, ...] = (
+    Category(
+        name="NMAP Reconnaissance",
+        path="scenarios/nmap",
+        count=30,
+        description="Network scanning and host discovery",
+    ),
+    Category(
+        name="SSH Brute Force",
+        path="scenarios/bruteforce",
+        count=6,
+        description="SSH credential attacks",
+    ),
+    Category(
+        name="SQL Injection",
+        path="scenarios/sqli",
+        count=6,
+        description="Database exploitation attacks",
+    ),
+    Category(
+        name="Denial of Service",
+        path="scenarios/denial_of_service",
+        count=17,
+        description="DoS and DDoS attacks",
+    ),
+    Category(
+        name="ARP Spoofing",
+        path="scenarios/mitm",
+        count=1,
+        description="Man-in-the-Middle attacks",
+    ),
+    Category(
+        name="MQTT Injection",
+        path="scenarios/mqtt_inj",
+        count=2,
+        description="False data injection",
+    ),
+    Category(
+        name="DNS Beaconing",
+        path="scenarios/dns_beacon",
+        count=1,
+        description="C2 communication simulation",
+    ),
+    Category(
+        name="Benign Traffic",
+        path="scenarios/benign",
+        count=3,
+        description="IoT baseline traffic generation",
+    ),
+)
+
+# Menu text is static, so it is rendered once at import and written in one go
+_HR_YELLOW = f"{Fore.YELLOW}{'━' * 44}{Style.RESET_ALL}"
+_HR_CYAN = f"{Fore.CYAN}{'━' * 67}{Style.RESET_ALL}"
+
+_MAIN_MENU = (
+    f"\n{_HR_YELLOW}\n"
+    f"{Fore.YELLOW}       Traffic Generation Categories{Style.RESET_ALL}\n"
+    f"{_HR_YELLOW}\n\n"
+    + "".join(
+        f" {Fore.GREEN}[{key}]{Style.RESET_ALL} {cat.name:<25} "
+        f"{Fore.CYAN}({cat.count:2} scenario{'s' if cat.count > 1 else ' '}){Style.RESET_ALL}\n"
+        for key, cat in enumerate(CATEGORIES, 1)
+    )
+    + f" {Fore.RED}[9]{Style.RESET_ALL} Exit\n\n"
+    f"{_HR_YELLOW}\n"
+)
+
+_HR_BENIGN = f"{Fore.CYAN}{'━' * 51}{Style.RESET_ALL}"
+
+_BENIGN_MENU = (
+    f"\n{_HR_BENIGN}\n"
+    f"{Fore.CYAN}  Benign Traffic - Select Component{Style.RESET_ALL}\n"
+    f"{_HR_BENIGN}\n\n"
+    f" {Fore.GREEN}[1]{Style.RESET_ALL} IoT Device Swarm        Generate sensor traffic\n"
+    f" {Fore.GREEN}[2]{Style.RESET_ALL} MQTT Bridge             Connect MQTT to database\n"
+    f" {Fore.GREEN}[3]{Style.RESET_ALL} Infrastructure Setup    Verify/configure services\n\n"
+    f" {Fore.YELLOW}[0]{Style.RESET_ALL} Back to main menu  |  {Fore.RED}[-1]{Style.RESET_ALL} Exit\n"
+    f"{_HR_BENIGN}\n"
+)
+
+# Benign submenu choices 1-3, in menu order
+_BENIGN_COMPONENTS = (
+    "01_device_swarm.yaml",
+    "02_mqtt_bridge.yaml",
+    "03_infrastructure.yaml",
+)
+
+_ARROW = f"{Fore.YELLOW}→{Style.RESET_ALL}"
+_CONFIRM_PROMPT = f"{_ARROW} Execute this scenario? [y/N]: "
+# Scenario menu cell: " [NN] Scenario <num>"
+_CELL_OPEN = f" {Fore.GREEN}["
+_CELL_LABEL = f"]{Style.RESET_ALL} Scenario "
+_ROW_TMPL = "{:25}{:25}{:25}\n"
+
+# Scenario details box
+_BAR = f"{Fore.CYAN}│{Style.RESET_ALL}"
+_BOX_TOP = f"{Fore.CYAN}┌{'─' * 61}┐{Style.RESET_ALL}"
+_BOX_BOTTOM = f"{Fore.CYAN}└{'─' * 61}┘{Style.RESET_ALL}"
+# One row: label, then the value padded (and cut) to the cell width
+_BOX_ROW = _BAR + " {label}{value:<{width}.{width}}" + _BAR
+
+# Placeholder configuration header/footer
+_HR_CONFIG = f"{Fore.CYAN}{'─' * 60}{Style.RESET_ALL}"
+_CONFIG_HEADER = (
+    f"\n{Fore.YELLOW}Configuration Required{Style.RESET_ALL}\n"
+    f"{_HR_CONFIG}\n"
+    f"Press {Fore.GREEN}Enter{Style.RESET_ALL} to use default values shown in "
+    f"{Fore.CYAN}[brackets]{Style.RESET_ALL}\n\n"
+)
+_CONFIG_FOOTER = f"\n{Fore.GREEN}✓{Style.RESET_ALL} Configuration complete\n{_HR_CONFIG}\n\n"
+
+_SCENARIO_MENU_FOOTER = (
+    f"\n {Fore.YELLOW}[ 0]{Style.RESET_ALL} Back to main menu  |  "
+    f"{Fore.RED}[-1]{Style.RESET_ALL} Exit\n"
+)
+
+
+def _load_scenario_listing(yaml_file: Path) -> dict:
+    """Load a scenario for display (shared, read-only); {} if it cannot be parsed."""
+    try:
+        return load_yaml_file(yaml_file, copy_data=False) or {}
+    except Exception:
+        return {}
 
 
 def print_banner():
@@ -83,79 +173,40 @@ def print_banner():
 
 def print_main_menu():
     """Print the main category selection menu."""
-    print(f"\n{Fore.YELLOW}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}       Traffic Generation Categories{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}\n")
-    
-    for key, cat in CATEGORIES.items():
-        count_str = f"({cat['count']:2} scenario{'s' if cat['count'] > 1 else ' '})"
-        print(f" {Fore.GREEN}[{key}]{Style.RESET_ALL} {cat['name']:<25} {Fore.CYAN}{count_str}{Style.RESET_ALL}")
-    
-    print(f" {Fore.RED}[9]{Style.RESET_ALL} Exit\n")
-    print(f"{Fore.YELLOW}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}")
+    sys.stdout.write(_MAIN_MENU)
 
 
-def scan_scenarios(category_path: Path) -> List[Tuple[str, Path, str]]:
+def scan_scenarios(category_path: Path) -> List[Tuple[str, Path, Optional[dict]]]:
     """
     Scan a category directory for scenario YAML files.
     
+    The menu only shows scenario numbers, so files are not parsed here;
+    the selected scenario is loaded when its details are shown.
+    
     Returns:
-        List of tuples (scenario_number, scenario_path, description)
+        List of tuples (scenario_number, scenario_path, None)
     """
-    if not category_path.exists():
-        return []
-    
-    scenarios = []
-    for yaml_file in sorted(category_path.glob("*.yaml")):
-        scenario_num = yaml_file.stem
-        
-        description = "No description"
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if data and 'scenario' in data and 'description' in data['scenario']:
-                    description = data['scenario']['description']
-        except Exception:
-            pass
-        
-        scenarios.append((scenario_num, yaml_file, description))
-    
-    return scenarios
+    # Same listing rules as `iottrafficgen list`
+    return [(path.stem, path, None) for path in scan_scenario_files(category_path)]
 
 
-def print_scenario_menu(category_name: str, scenarios: List[Tuple[str, Path, str]]):
+def print_scenario_menu(category_name: str, scenarios: List[Tuple[str, Path, Optional[dict]]]):
     """Print compact scenario selection menu in columns."""
-    print(f"\n{Fore.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}  {category_name} - Select Scenario{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}\n")
+    cells = [
+        f"{_CELL_OPEN}{idx+1:2}{_CELL_LABEL}{num}"
+        for idx, (num, _, _) in enumerate(scenarios)
+    ]
+    cells += [""] * (-len(cells) % 3)
     
-    num_scenarios = len(scenarios)
-    for i in range(0, num_scenarios, 3):
-        row = []
-        for j in range(3):
-            idx = i + j
-            if idx < num_scenarios:
-                num, _, _ = scenarios[idx]
-                row.append(f" {Fore.GREEN}[{idx+1:2}]{Style.RESET_ALL} Scenario {num}")
-            else:
-                row.append(" " * 20)
-        print("".join(f"{item:25}" for item in row))
-    
-    print(f"\n {Fore.YELLOW}[ 0]{Style.RESET_ALL} Back to main menu  |  {Fore.RED}[-1]{Style.RESET_ALL} Exit")
+    parts = [f"\n{_HR_CYAN}\n{Fore.CYAN}  {category_name} - Select Scenario{Style.RESET_ALL}\n{_HR_CYAN}\n\n"]
+    parts += [_ROW_TMPL.format(*cells[i:i + 3]) for i in range(0, len(cells), 3)]
+    parts.append(_SCENARIO_MENU_FOOTER)
+    sys.stdout.write("".join(parts))
 
 
 def print_benign_submenu():
     """Print benign traffic component selection submenu."""
-    print(f"\n{Fore.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}  Benign Traffic - Select Component{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}\n")
-    
-    print(f" {Fore.GREEN}[1]{Style.RESET_ALL} IoT Device Swarm        Generate sensor traffic")
-    print(f" {Fore.GREEN}[2]{Style.RESET_ALL} MQTT Bridge             Connect MQTT to database")
-    print(f" {Fore.GREEN}[3]{Style.RESET_ALL} Infrastructure Setup    Verify/configure services\n")
-    
-    print(f" {Fore.YELLOW}[0]{Style.RESET_ALL} Back to main menu  |  {Fore.RED}[-1]{Style.RESET_ALL} Exit")
-    print(f"{Fore.CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}")
+    sys.stdout.write(_BENIGN_MENU)
 
 
 def show_benign_submenu(workspace: Path) -> Optional[list]:
@@ -165,16 +216,12 @@ def show_benign_submenu(workspace: Path) -> Optional[list]:
     Returns:
         List with single scenario tuple, or None if user exits, or empty list if back
     """
-    benign_components = {
-        1: "01_device_swarm.yaml",
-        2: "02_mqtt_bridge.yaml",
-        3: "03_infrastructure.yaml"
-    }
+    benign_dir = workspace / "scenarios" / "benign"
     
     while True:
         print_benign_submenu()
         
-        component_choice = get_input("Select [1-3] or 0 (back) or -1 (exit):", range(0, 4))
+        component_choice = get_input("Select [1-3] or 0 (back) or -1 (exit):", 0, 3)
         
         if component_choice == -1:
             return None
@@ -182,40 +229,42 @@ def show_benign_submenu(workspace: Path) -> Optional[list]:
         if component_choice == 0:
             return []
         
-        scenario_file = benign_components[component_choice]
-        scenario_path = workspace / "scenarios" / "benign" / scenario_file
+        scenario_path = benign_dir / _BENIGN_COMPONENTS[component_choice - 1]
         
         if not scenario_path.exists():
-            print(f"\n{Fore.RED}Scenario not found: {scenario_path}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}")
+            sys.stdout.write(
+                f"\n{Fore.RED}Scenario not found: {scenario_path}{Style.RESET_ALL}\n"
+                f"{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}\n"
+            )
             input()
             continue
         
-        try:
-            with open(scenario_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if data and 'scenario' in data and 'description' in data['scenario']:
-                    description = data['scenario']['description']
-                else:
-                    description = "No description"
-        except Exception:
-            description = "No description"
-        
-        return [(scenario_path.stem, scenario_path, description)]
+        return [(scenario_path.stem, scenario_path, None)]
 
 
-def get_input(prompt: str, valid_range: range) -> int:
-    """Get validated integer input from user."""
+def get_input(prompt: str, lo: int, hi: int) -> int:
+    """Get validated integer input from user, in lo..hi inclusive or -1."""
+    full_prompt = f"{_ARROW} {prompt} "
+    
     while True:
         try:
-            print(f"{Fore.YELLOW}→{Style.RESET_ALL} {prompt}", end=" ")
-            choice = input().strip()
+            choice = input(full_prompt).strip()
             
             if not choice:
                 continue
             
-            value = int(choice)
-            if value in valid_range or value == -1:
+            # Check the digits up front instead of letting int() raise on
+            # bad input; an optional leading '-' is allowed
+            negative = choice.startswith('-')
+            digits = choice[1:] if negative else choice
+            if not digits.isdigit():
+                print(f"{Fore.RED}Please enter a valid number.{Style.RESET_ALL}")
+                continue
+            
+            value = -int(digits) if negative else int(digits)
+            if value == -1:
+                return -1
+            if lo <= value <= hi:
                 return value
             else:
                 print(f"{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
@@ -226,86 +275,90 @@ def get_input(prompt: str, valid_range: range) -> int:
             sys.exit(0)
 
 
-def print_scenario_details(scenario_num: str, scenario_path: Path, description: str):
+def print_scenario_details(scenario_num: str, scenario_path: Path, data: Optional[dict] = None):
     """Print detailed information about a selected scenario."""
+    if data is None:
+        data = _load_scenario_listing(scenario_path)
+    
     name = "Unknown"
+    description = "No description"
     profile = "Unknown"
     script = "Unknown"
     
     try:
-        with open(scenario_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            if data:
-                if 'scenario' in data and 'name' in data['scenario']:
-                    name = data['scenario']['name']
-                if 'runs' in data and len(data['runs']) > 0:
-                    run = data['runs'][0]
-                    if 'profile' in run:
-                        profile = Path(run['profile']).name
-                    if 'script' in run:
-                        script = Path(run['script']).name
+        if 'scenario' in data:
+            name = data['scenario'].get('name', name)
+            description = data['scenario'].get('description', description)
+        if 'runs' in data and len(data['runs']) > 0:
+            run = data['runs'][0]
+            if 'profile' in run:
+                profile = Path(run['profile']).name
+            if 'script' in run:
+                script = Path(run['script']).name
     except Exception:
         pass
     
-    print(f"\n{Fore.YELLOW}Scenario Details:{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}┌─────────────────────────────────────────────────────────────┐{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}│{Style.RESET_ALL} Name: {name:<53}{Fore.CYAN}│{Style.RESET_ALL}")
+    # Wrap to the 47-column description cell so long text stays inside the box
+    desc_lines = textwrap.wrap(description, width=47) or [description]
     
-    desc_lines = []
-    if len(description) <= 53:
-        desc_lines.append(description)
-    else:
-        words = description.split()
-        current_line = ""
-        for word in words:
-            if len(current_line) + len(word) + 1 <= 53:
-                current_line += (word + " ")
-            else:
-                desc_lines.append(current_line.strip())
-                current_line = word + " "
-        if current_line:
-            desc_lines.append(current_line.strip())
-    
-    for i, line in enumerate(desc_lines):
-        if i == 0:
-            print(f"{Fore.CYAN}│{Style.RESET_ALL} Description: {line:<47}{Fore.CYAN}│{Style.RESET_ALL}")
-        else:
-            print(f"{Fore.CYAN}│{Style.RESET_ALL}              {line:<47}{Fore.CYAN}│{Style.RESET_ALL}")
-    
-    print(f"{Fore.CYAN}│{Style.RESET_ALL} Profile: {profile:<50}{Fore.CYAN}│{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}│{Style.RESET_ALL} Script:  {script:<50}{Fore.CYAN}│{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}└─────────────────────────────────────────────────────────────┘{Style.RESET_ALL}\n")
+    row = _BOX_ROW.format
+    lines = [
+        f"\n{Fore.YELLOW}Scenario Details:{Style.RESET_ALL}",
+        _BOX_TOP,
+        row(label="Name: ", value=str(name), width=53),
+        row(label="Description: ", value=desc_lines[0], width=47),
+    ]
+    lines += [row(label=" " * 13, value=line, width=47) for line in desc_lines[1:]]
+    lines += [
+        row(label="Profile: ", value=profile, width=50),
+        row(label="Script:  ", value=script, width=50),
+        _BOX_BOTTOM,
+    ]
+    sys.stdout.write("\n".join(lines) + "\n\n")
 
 
-def detect_and_configure_placeholders(scenario_path: Path) -> Optional[Path]:
+def detect_and_configure_placeholders(
+    scenario_path: Path,
+    data: Optional[dict] = None,
+) -> Optional[Path]:
     """
     Detect placeholders in scenario and prompt for configuration.
-    Creates a temporary configured YAML file.
+    Creates a temporary configured YAML file, unless the configuration
+    leaves the scenario unchanged.
     
     Placeholders can have default values in the original YAML.
     If user presses Enter without typing, the default is used.
     
+    Args:
+        scenario_path: Path to scenario YAML
+        data: Already parsed scenario, if the caller has it (not mutated)
+    
     Returns:
-        Path to configured temporary YAML, or None if user cancels
+        Path to configured temporary YAML (or scenario_path itself if
+        nothing changed), or None if user cancels
     """
-    import tempfile
-    import shutil
-    
+    # Work on a copy: the runs below are rewritten in place
     try:
-        with open(scenario_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        if data is None:
+            data = load_yaml_file(scenario_path)
+        else:
+            data = copy.deepcopy(data)
     except Exception as e:
         print(f"{Fore.RED}Error reading scenario: {e}{Style.RESET_ALL}")
         return None
     
     env_vars = {}
     defaults = {}
+    # (run index, env key) of every env entry, so values can be written
+    # back later without walking all runs and env dicts again
+    env_sites = []
     
     # Extract ALL environment variables from runs
     if 'runs' in data:
-        for run in data['runs']:
+        for run_index, run in enumerate(data['runs']):
             if 'env' in run:
                 for key, value in run['env'].items():
+                    env_sites.append((run_index, key))
                     if isinstance(value, str):
                         env_vars[key] = value
                         # Extract default value
@@ -329,9 +382,7 @@ def detect_and_configure_placeholders(scenario_path: Path) -> Optional[Path]:
         return scenario_path
     
     # Prompt user for values
-    print(f"\n{Fore.YELLOW}Configuration Required{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}{'─' * 60}{Style.RESET_ALL}")
-    print(f"Press {Fore.GREEN}Enter{Style.RESET_ALL} to use default values shown in {Fore.CYAN}[brackets]{Style.RESET_ALL}\n")
+    sys.stdout.write(_CONFIG_HEADER)
     
     user_values = {}
     
@@ -364,40 +415,44 @@ def detect_and_configure_placeholders(scenario_path: Path) -> Optional[Path]:
     
     # Create temporary configured YAML
     try:
+        # Only write a temp scenario if something actually changed
+        modified = False
+        
         # Replace placeholders in env
+        for run_index, key in env_sites:
+            env = data['runs'][run_index]['env']
+            if key in user_values and env[key] != user_values[key]:
+                env[key] = user_values[key]
+                modified = True
+        
         if 'runs' in data:
+            # resolve() rather than lexical normalisation: with a symlinked
+            # scenario directory `..` must mean what the kernel makes of it
+            scenario_dir = scenario_path.parent.resolve()
+            # Loop invariants for the WORDLIST search below
+            cwd = Path.cwd()
+            wordlist_dir = scenario_path.parent.parent.parent / 'scripts' / 'attacks' / 'bruteforce'
+            
             for run in data['runs']:
-                if 'env' in run:
-                    for key, value in run['env'].items():
-                        if key in user_values:
-                            run['env'][key] = user_values[key]
-                
-                # Resolve relative script paths to absolute
-                if 'script' in run:
-                    script_path = Path(run['script'])
-                    if not script_path.is_absolute():
-                        absolute_script = (scenario_path.parent / script_path).resolve()
-                        run['script'] = str(absolute_script)
-                
-                # Resolve relative profile paths to absolute
-                if 'profile' in run:
-                    profile_path = Path(run['profile'])
-                    if not profile_path.is_absolute():
-                        absolute_profile = (scenario_path.parent / profile_path).resolve()
-                        run['profile'] = str(absolute_profile)
+                # Resolve relative script and profile paths to absolute
+                for key in ('script', 'profile'):
+                    value = run.get(key)
+                    if value and not os.path.isabs(value):
+                        run[key] = str((scenario_dir / value).resolve())
+                        modified = True
                 
                 # Special handling for WORDLIST paths
                 if 'env' in run and 'WORDLIST' in run['env']:
                     wordlist_value = run['env']['WORDLIST']
+                    original_wordlist = wordlist_value
                     wordlist_path = Path(wordlist_value)
                     
                     if wordlist_path.is_absolute():
                         run['env']['WORDLIST'] = str(wordlist_path)
                     elif '/' not in wordlist_value and '\\' not in wordlist_value:
-                        project_root = scenario_path.parent.parent.parent
                         search_paths = [
-                            Path.cwd() / wordlist_value,
-                            project_root / 'scripts' / 'attacks' / 'bruteforce' / wordlist_value,
+                            cwd / wordlist_value,
+                            wordlist_dir / wordlist_value,
                         ]
                         
                         found = False
@@ -410,8 +465,13 @@ def detect_and_configure_placeholders(scenario_path: Path) -> Optional[Path]:
                         if not found:
                             run['env']['WORDLIST'] = wordlist_value
                     else:
-                        absolute_wordlist = (Path.cwd() / wordlist_path).resolve()
+                        # resolve(), not normpath: a `..` in a user-supplied
+                        # path must mean what the kernel makes of it
+                        absolute_wordlist = (cwd / wordlist_path).resolve()
                         run['env']['WORDLIST'] = str(absolute_wordlist)
+                    
+                    if run['env']['WORDLIST'] != original_wordlist:
+                        modified = True
         
         # Replace marker host placeholder
         if 'MARKER_HOST' in user_values:
@@ -420,18 +480,26 @@ def detect_and_configure_placeholders(scenario_path: Path) -> Optional[Path]:
             if 'markers' not in data['scenario']:
                 data['scenario']['markers'] = {}
             data['scenario']['markers']['host'] = user_values['MARKER_HOST']
+            modified = True
         
-        # Create temporary file
-        temp_fd, temp_path = tempfile.mkstemp(suffix='.yaml', prefix='iottrafficgen_')
-        temp_file = Path(temp_path)
-        
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        if modified:
+            # Create temporary file (one open, closed on every path)
+            with tempfile.NamedTemporaryFile(
+                mode='w',
+                suffix='.yaml',
+                prefix='iottrafficgen_',
+                delete=False,
+                encoding='utf-8',
+            ) as f:
+                safe_dump(data, f, default_flow_style=False, sort_keys=False)
+            configured_path = Path(f.name)
+        else:
+            # Defaults accepted and paths already absolute: run the original
+            configured_path = scenario_path
         
-        print(f"\n{Fore.GREEN}✓{Style.RESET_ALL} Configuration complete")
-        print(f"{Fore.CYAN}{'─' * 60}{Style.RESET_ALL}\n")
+        sys.stdout.write(_CONFIG_FOOTER)
         
-        return temp_file
+        return configured_path
         
     except Exception as e:
         print(f"{Fore.RED}Error creating configured scenario: {e}{Style.RESET_ALL}")
@@ -440,10 +508,8 @@ def detect_and_configure_placeholders(scenario_path: Path) -> Optional[Path]:
 
 def confirm_execution(scenario_path: Path) -> bool:
     """Ask user to confirm scenario execution."""
-    print(f"{Fore.YELLOW}→{Style.RESET_ALL} Execute this scenario? [y/N]: ", end="")
-    
     try:
-        response = input().strip().lower()
+        response = input(_CONFIRM_PROMPT).strip().lower()
         return response in ('y', 'yes')
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}Cancelled.{Style.RESET_ALL}")
@@ -462,14 +528,14 @@ def interactive_mode(workspace: Path) -> Optional[Path]:
     while True:
         print_main_menu()
         
-        choice = get_input("Select [1-9]:", range(1, 10))
+        choice = get_input("Select [1-9]:", 1, 9)
         
         if choice == 9 or choice == -1:
             print(f"\n{Fore.YELLOW}Exiting...{Style.RESET_ALL}")
             return None
         
-        category = CATEGORIES[str(choice)]
-        category_path = workspace / category["path"]
+        category = CATEGORIES[choice - 1]
+        category_path = workspace / category.path
         
         if choice == 8:
             scenarios = show_benign_submenu(workspace)
@@ -481,18 +547,19 @@ def interactive_mode(workspace: Path) -> Optional[Path]:
             scenarios = scan_scenarios(category_path)
         
         if not scenarios:
-            print(f"\n{Fore.RED}No scenarios found in {category_path}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}")
+            sys.stdout.write(
+                f"\n{Fore.RED}No scenarios found in {category_path}{Style.RESET_ALL}\n"
+                f"{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}\n"
+            )
             input()
             continue
         
+        scenario_prompt = f"Select [1-{len(scenarios)}] or 0 (back) or -1 (exit):"
+        
         while True:
-            print_scenario_menu(category["name"], scenarios)
+            print_scenario_menu(category.name, scenarios)
             
-            scenario_choice = get_input(
-                f"Select [1-{len(scenarios)}] or 0 (back) or -1 (exit):",
-                range(0, len(scenarios) + 1)
-            )
+            scenario_choice = get_input(scenario_prompt, 0, len(scenarios))
             
             if scenario_choice == -1:
                 print(f"\n{Fore.YELLOW}Exiting...{Style.RESET_ALL}")
@@ -501,11 +568,17 @@ def interactive_mode(workspace: Path) -> Optional[Path]:
             if scenario_choice == 0:
                 break
             
-            scenario_num, selected_scenario, description = scenarios[scenario_choice - 1]
+            scenario_num, selected_scenario, data = scenarios[scenario_choice - 1]
+            
+            # Parse only the chosen scenario, once, for details and placeholders
+            if data is None:
+                data = _load_scenario_listing(selected_scenario)
             
-            print_scenario_details(scenario_num, selected_scenario, description)
+            print_scenario_details(scenario_num, selected_scenario, data)
             
-            configured_scenario = detect_and_configure_placeholders(selected_scenario)
+            # An empty dict means the file could not be parsed; let the
+            # placeholder step re-read it and report the error
+            configured_scenario = detect_and_configure_placeholders(selected_scenario, data or None)
             
             if configured_scenario is None:
                 print(f"{Fore.YELLOW}Returning to menu...{Style.RESET_ALL}\n")
@@ -1,8 +1,11 @@
 """
 Logging system for iottrafficgen
 """
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
@@ -17,13 +20,36 @@ COLORS = {
 }
 
 
+# Background writer for the current run's log file (see setup_logging)
+_file_listener: Optional[QueueListener] = None
+
+
+def _stop_file_listener() -> None:
+    """Flush pending file records, stop the writer thread and close the file."""
+    global _file_listener
+    if _file_listener is not None:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+
+
+atexit.register(_stop_file_listener)
+
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors for console output."""
     
+    # Colored level names, built once instead of per record
+    _COLORED_LEVELS = {
+        name: f"{code}{name}{COLORS['RESET']}"
+        for name, code in COLORS.items()
+        if name != 'RESET'
+    }
+    
     def format(self, record):
         original_levelname = record.levelname
-        if original_levelname in COLORS:
-            record.levelname = f"{COLORS[original_levelname]}{original_levelname}{COLORS['RESET']}"
+        record.levelname = self._COLORED_LEVELS.get(original_levelname, original_levelname)
         try:
             return super().format(record)
         finally:
@@ -47,8 +73,9 @@ def setup_logging(
         Configured logger instance
     """
     logger = logging.getLogger('iottrafficgen')
-    logger.setLevel(logging.DEBUG)
     logger.handlers.clear()
+    # Finish writing the previous run's log before switching files
+    _stop_file_listener()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -60,6 +87,10 @@ def setup_logging(
     else:
         console_handler.setLevel(logging.INFO)
     
+    # Logger level tracks the most verbose handler so disabled records
+    # (and their arguments) are dropped before any formatting happens
+    logger.setLevel(logging.DEBUG if log_dir else console_handler.level)
+    
     console_format = ColoredFormatter(
         '%(asctime)s [%(levelname)s] %(message)s',
         datefmt='%H:%M:%S'
@@ -80,9 +111,17 @@ def setup_logging(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
         
-        logger.debug(f"Logging to file: {log_file}")
+        # File writes happen on a listener thread so logging calls on the
+        # execution path only enqueue. The console stays synchronous to keep
+        # its ordering with the click output around it.
+        global _file_listener
+        log_queue = queue.SimpleQueue()
+        _file_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _file_listener.start()
+        logger.addHandler(QueueHandler(log_queue))
+        
+        logger.debug("Logging to file: %s", log_file)
     
     return logger
 
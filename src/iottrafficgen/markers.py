@@ -4,7 +4,6 @@ Ground truth marker system for traffic synchronization
 import json
 import socket
 import time
-from datetime import datetime
 from typing import Any
 import click
 
@@ -21,6 +20,16 @@ class MarkerSystem:
         self.enabled = enabled
         self.host = host
         self.port = port
+        self._addr = (host, port)
+        
+        # One socket for the lifetime of the scenario instead of one per marker.
+        # Left unconnected: a connected UDP socket reports ICMP port-unreachable
+        # on the next send and drops that datagram, but markers must reach the
+        # wire even when nothing is listening on the marker port.
+        self._sock: socket.socket | None = None
+        if enabled:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._sock.settimeout(1.0)
     
     def send(
         self,
@@ -38,16 +47,20 @@ class MarkerSystem:
             attack_name: Human-readable attack name
             metadata: Additional metadata to include in marker
         """
-        if not self.enabled:
+        if not self.enabled or self._sock is None:
             return
         
+        # One clock read for both timestamps, formatted without a datetime
+        seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+        ts_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        
         payload = {
             "type": "GROUND_TRUTH",
             "event": event,
             "attack_id": attack_id,
             "attack": attack_name,
-            "ts_unix": int(time.time()),
-            "ts_iso_utc": datetime.utcnow().isoformat() + "Z",
+            "ts_unix": seconds,
+            "ts_iso_utc": f"{ts_iso}.{nanos // 1000:06d}Z",
             "duration_mode": "EPISODIC",
         }
         
@@ -55,18 +68,25 @@ class MarkerSystem:
             payload.update(metadata)
         
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(1.0)
-            sock.sendto(
-                json.dumps(payload).encode("utf-8"),
-                (self.host, self.port)
-            )
-            sock.close()
+            self._sock.sendto(json.dumps(payload).encode("utf-8"), self._addr)
             click.echo(f"    -> Marker: {event} -> {self.host}:{self.port}")
         except socket.timeout:
             click.secho(f"    [WARNING] Marker timeout: {self.host}:{self.port}", fg="yellow")
         except Exception as e:
             click.secho(f"    [WARNING] Marker error: {e}", fg="yellow")
+    
+    def close(self) -> None:
+        """Close the marker socket."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+    
+    def __del__(self):
+        # Safety net for callers that never reach close()
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 def create_marker_system_from_scenario(scenario_data: dict) -> MarkerSystem:
@@ -1,19 +1,20 @@
 """
 Data models for iottrafficgen
 """
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class ScenarioMetadata:
     """Metadata about a scenario"""
     name: str
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Profile:
     """Configuration profile loaded from YAML"""
     tool: str
@@ -33,7 +34,18 @@ class Profile:
         )
 
 
-@dataclass
+def _env_value(value: Any) -> str:
+    """Render a YAML env value the way a shell script expects it"""
+    # `KEY:` with no value loads as None and means "empty", not "None";
+    # booleans follow YAML/shell spelling rather than Python's True/False
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+@dataclass(slots=True)
 class Run:
     """A single execution run within a scenario"""
     id: str
@@ -46,13 +58,24 @@ class Run:
     @classmethod
     def from_yaml(cls, data: dict[str, Any], scenario_dir: Path) -> "Run":
         """Create Run from parsed YAML data"""
-        # Resolve script path relative to scenario file
-        script_path = scenario_dir / data["script"]
+        # Resolve script path relative to scenario file, once, so later
+        # str()/stat calls work on a short absolute path. realpath keeps
+        # `..` meaning what the kernel makes of it behind a symlinked
+        # scenario directory and, unlike Path.resolve(), does not raise
+        # on a symlink loop (reported later as script not found).
+        script_path = Path(os.path.realpath(scenario_dir / data["script"]))
         
         # Resolve profile path if present
         profile_path = None
         if "profile" in data:
-            profile_path = scenario_dir / data["profile"]
+            profile_path = Path(os.path.realpath(scenario_dir / data["profile"]))
+        
+        # Coerce env to str once here: unquoted YAML scalars (ports, durations)
+        # load as int/float and would otherwise fail when passed to the script
+        env = {
+            str(key): _env_value(value)
+            for key, value in (data.get("env") or {}).items()
+        }
         
         return cls(
             id=data["id"],
@@ -60,11 +83,11 @@ class Run:
             run_type=data["type"],
             label=data.get("label"),
             profile=profile_path,
-            env=data.get("env", {}),
+            env=env,
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Scenario:
     """A complete traffic generation scenario"""
     metadata: ScenarioMetadata
@@ -89,7 +112,7 @@ class Scenario:
         return cls(metadata=metadata, runs=runs)
 
 
-@dataclass
+@dataclass(slots=True)
 class RunResult:
     """Result of executing a run"""
     run_id: str
@@ -1,30 +1,138 @@
 """
 Utility functions for iottrafficgen
 """
+import asyncio
+import copy
+import json
+import os
+import re
+import selectors
+import signal
 import subprocess
-from datetime import datetime
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from .errors import MISSING_PATH_ERRNOS
+
+# Prefer the libyaml C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Parsed YAML files keyed by absolute path, with the (st_mtime_ns, st_size,
+# st_ino) they were parsed from; st_ino catches files replaced atomically
+_YAML_CACHE_MAX = 128
+_yaml_cache: "OrderedDict[str, tuple[tuple[int, int, int], Any]]" = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+# Files up to this size are read whole before parsing
+_YAML_READ_ALL_MAX = 1024 * 1024
+
+# (unix second, "YYYY-MM-DDTHH:MM:SS") of the last get_timestamp_utc call
+_last_ts_prefix: tuple[int, str] = (-1, "")
+
+# Opt-in cross-process cache: <file>.yaml.json next to each parsed YAML
+YAML_JSON_CACHE_ENV = "IOTTRAFFICGEN_YAML_JSON_CACHE"
+# Returned by _read_json_sidecar on a miss; None is valid cached data
+# (an empty YAML file)
+_SIDECAR_MISS = object()
+
+
+def safe_load(stream: Any) -> Any:
+    """Parse YAML from a string, bytes or file object using the safe loader"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream: Any = None, **kwargs: Any) -> Any:
+    """Serialize data to YAML using the safe dumper"""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
 
 def get_timestamp_utc() -> str:
     """Get current UTC timestamp in ISO format"""
-    return datetime.utcnow().isoformat() + "Z"
+    global _last_ts_prefix
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    # Calls within the same second reuse the formatted date/time part
+    cached = _last_ts_prefix
+    if cached[0] == seconds:
+        prefix = cached[1]
+    else:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _last_ts_prefix = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}Z"
 
 
 def get_timestamp_unix() -> int:
     """Get current Unix timestamp"""
-    return int(datetime.utcnow().timestamp())
+    return time.time_ns() // 1_000_000_000
+
 
+def _read_json_sidecar(sidecar: str, signature: tuple[int, int, int]) -> Any:
+    """Return the sidecar's data if it was written for this exact YAML file, else _SIDECAR_MISS."""
+    try:
+        with open(sidecar, "rb") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return _SIDECAR_MISS
+    # An mtime comparison alone is fooled by `cp -p` or an atomic replace
+    # with an older file, so require the same (mtime_ns, size, inode)
+    # the in-memory cache checks
+    if not isinstance(payload, dict) or payload.get("signature") != list(signature):
+        return _SIDECAR_MISS
+    return payload.get("data", _SIDECAR_MISS)
 
-def load_yaml_file(path: Path) -> dict[str, Any]:
+
+def _write_json_sidecar(sidecar: str, signature: tuple[int, int, int], data: Any) -> None:
+    """Atomically write data with the YAML signature; skipped if JSON cannot represent it exactly."""
+    try:
+        text = json.dumps({"signature": list(signature), "data": data})
+    except (TypeError, ValueError):
+        return
+    # Non-string keys, tuples, dates etc. would not survive the round trip
+    if json.loads(text)["data"] != data:
+        return
+    
+    # Read-only directory or similar: the sidecar is only an optimisation
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(sidecar),
+            prefix=".iottrafficgen_",
+            suffix=".tmp",
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def load_yaml_file(path: Path, copy_data: bool = True) -> dict[str, Any]:
     """
     Load and parse a YAML file.
     
+    Parsed files are cached until their mtime, size or inode changes;
+    by default each call returns a fresh deep copy that the caller may
+    modify.
+    With IOTTRAFFICGEN_YAML_JSON_CACHE=1 the parse result is also stored
+    in a JSON sidecar (<file>.yaml.json) that later processes load instead
+    of the YAML while its recorded mtime, size and inode still match.
+    
     Args:
         path: Path to YAML file
+        copy_data: Return a deep copy; pass False for read-only use of
+            the shared cached object
         
     Returns:
         Parsed YAML content as dictionary
@@ -33,14 +141,85 @@ def load_yaml_file(path: Path) -> dict[str, Any]:
         FileNotFoundError: If file doesn't exist
         yaml.YAMLError: If file is not valid YAML
     """
-    if not path.exists():
-        raise FileNotFoundError(f"YAML file not found: {path}")
+    key = os.path.abspath(path)
+    try:
+        st = os.stat(key)
+    except OSError as e:
+        if e.errno not in MISSING_PATH_ERRNOS:
+            raise
+        raise FileNotFoundError(f"YAML file not found: {path}") from None
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
     
-    with open(path, "r", encoding="utf-8") as f:
+    with _yaml_cache_lock:
+        hit = _yaml_cache.get(key)
+        if hit is not None and hit[0] == signature:
+            _yaml_cache.move_to_end(key)
+            return copy.deepcopy(hit[1]) if copy_data else hit[1]
+    
+    use_sidecar = os.environ.get(YAML_JSON_CACHE_ENV) == "1"
+    sidecar = key + ".json"
+    data = _read_json_sidecar(sidecar, signature) if use_sidecar else _SIDECAR_MISS
+    
+    if data is _SIDECAR_MISS:
+        # Binary input: libyaml detects the encoding and decodes in C.
+        # Typical files are read in one go; very large ones are streamed
+        # to keep peak memory bounded.
         try:
-            return yaml.safe_load(f)
+            if st.st_size <= _YAML_READ_ALL_MAX:
+                data = safe_load(Path(key).read_bytes())
+            else:
+                with open(key, "rb") as f:
+                    data = safe_load(f)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML in {path}: {e}")
+        if use_sidecar:
+            _write_json_sidecar(sidecar, signature, data)
+    
+    with _yaml_cache_lock:
+        _yaml_cache[key] = (signature, data)
+        _yaml_cache.move_to_end(key)
+        if len(_yaml_cache) > _YAML_CACHE_MAX:
+            _yaml_cache.popitem(last=False)
+    
+    return copy.deepcopy(data) if copy_data else data
+
+
+_REQUIRED_RUN_ORDER = ("id", "script", "type")
+_REQUIRED_RUN_KEYS = frozenset(_REQUIRED_RUN_ORDER)
+# Run ids become part of the run directory name
+_RUN_ID_RE = re.compile(r"\A[A-Za-z0-9_.-]+\Z")
+
+
+def scan_scenario_files(root: Path) -> list[Path]:
+    """
+    List the scenario YAML files directly inside a directory.
+    
+    Uses a single os.scandir pass, whose cached entry types avoid a
+    separate stat() per file for the usual case.
+    
+    Args:
+        root: Directory to scan (hidden files are skipped)
+        
+    Returns:
+        Sorted list of paths; empty if root cannot be read
+    """
+    found = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.name.startswith('.') or not entry.name.endswith((".yaml", ".yml")):
+                    continue
+                # A broken or looping symlink only skips that entry
+                try:
+                    if entry.is_file():
+                        found.append(Path(entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    
+    found.sort()
+    return found
 
 
 def validate_scenario_schema(data: dict[str, Any]) -> None:
@@ -70,52 +249,277 @@ def validate_scenario_schema(data: dict[str, Any]) -> None:
     if len(runs) == 0:
         raise ValueError("Scenario must have at least one run")
     
-    # Validate each run
+    # Validate each run: one set difference per run, and only a failing
+    # run pays for working out which key to report
     for i, run in enumerate(runs):
-        if "id" not in run:
-            raise ValueError(f"Run {i} missing required 'id' field")
-        if "script" not in run:
-            raise ValueError(f"Run {i} missing required 'script' field")
-        if "type" not in run:
-            raise ValueError(f"Run {i} missing required 'type' field")
+        if not isinstance(run, dict):
+            raise ValueError(f"Run {i} must be a mapping")
+        missing = _REQUIRED_RUN_KEYS - run.keys()
+        if missing:
+            key = next(k for k in _REQUIRED_RUN_ORDER if k in missing)
+            raise ValueError(f"Run {i} missing required '{key}' field")
+        if not _RUN_ID_RE.match(str(run["id"])):
+            raise ValueError(
+                f"Run {i} has invalid 'id' {run['id']!r} "
+                "(use letters, digits, '_', '.' or '-')"
+            )
+
+
+# Output kept per stream by execute_shell_script (the tail, if longer)
+MAX_TAIL_BYTES = 1024 * 1024
+
+
+class _OutputTail:
+    """Last max_bytes of a byte stream, kept as a bounded deque of chunks."""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+    
+    def append(self, chunk: bytes) -> None:
+        if self.max_bytes <= 0:
+            return
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        # Drop whole chunks from the front while the rest still covers
+        # max_bytes, so memory stays bounded however much is written
+        while self._size - len(self._chunks[0]) >= self.max_bytes:
+            self._size -= len(self._chunks.popleft())
+    
+    def value(self) -> bytes:
+        if self.max_bytes <= 0:
+            return b""
+        return b"".join(self._chunks)[-self.max_bytes:]
+
+
+def _run_capture_tail(
+    args: list[str],
+    env: dict[str, str],
+    timeout: float | None,
+    max_bytes: int = MAX_TAIL_BYTES,
+) -> tuple[int, bytes, bytes]:
+    """
+    Run a command and keep only the last max_bytes of stdout and stderr.
+    
+    Args:
+        args: Command line
+        env: Environment for the child
+        timeout: Optional timeout in seconds
+        max_bytes: Bytes of output kept per stream (0 keeps none)
+        
+    Returns:
+        Tuple (returncode, stdout_tail, stderr_tail)
+        
+    Raises:
+        subprocess.TimeoutExpired: If the command outlives the timeout
+            (it is killed first)
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    
+    # close_fds=False lets CPython launch via posix_spawn; descriptors
+    # Python opens are non-inheritable anyway (PEP 446), so only the
+    # pipes and stdio reach the child.
+    with subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        close_fds=False,
+        env=env,
+    ) as proc, selectors.DefaultSelector() as selector:
+        tails = {proc.stdout: _OutputTail(max_bytes), proc.stderr: _OutputTail(max_bytes)}
+        for stream in tails:
+            selector.register(stream, selectors.EVENT_READ)
+        
+        def remaining() -> float | None:
+            return None if deadline is None else deadline - time.monotonic()
+        
+        try:
+            while selector.get_map():
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                for key, _ in selector.select(left):
+                    chunk = os.read(key.fd, 65536)
+                    if chunk:
+                        tails[key.fileobj].append(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+            returncode = proc.wait(timeout=remaining())
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise subprocess.TimeoutExpired(
+                args,
+                timeout,
+                output=tails[proc.stdout].value(),
+                stderr=tails[proc.stderr].value(),
+            ) from None
+        except BaseException:
+            # KeyboardInterrupt or any other error: never leave the child
+            # running, as subprocess.run guarantees
+            proc.kill()
+            proc.wait()
+            raise
+        
+        return returncode, tails[proc.stdout].value(), tails[proc.stderr].value()
+
+
+def _completed(
+    args: list[str],
+    returncode: int,
+    stdout: bytes,
+    stderr: bytes,
+    binary: bool,
+) -> subprocess.CompletedProcess:
+    """Build the CompletedProcess, decoding each stream once unless binary."""
+    if not binary:
+        stdout = stdout.decode("utf-8", errors="replace")
+        stderr = stderr.decode("utf-8", errors="replace")
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+def _prepare_script(script_path: Path, env_vars: dict[str, str]) -> dict[str, str]:
+    """
+    Make sure a script exists and is executable, and build its environment.
+    
+    Args:
+        script_path: Path to script
+        env_vars: Environment variables to pass
+        
+    Returns:
+        Full environment for the child process
+        
+    Raises:
+        FileNotFoundError: If the script doesn't exist
+    """
+    try:
+        st = script_path.stat()
+    except OSError as e:
+        if e.errno not in MISSING_PATH_ERRNOS:
+            raise
+        raise FileNotFoundError(f"Script not found: {script_path}") from None
+    
+    # Make script executable (skip the chmod when it already is)
+    if st.st_mode & 0o111 != 0o111:
+        script_path.chmod(0o755)
+    
+    # Prepare environment
+    env = os.environ.copy()
+    # Run.env is already str -> str; only stringify when a caller passes
+    # raw YAML values (ints, floats)
+    if all(isinstance(k, str) and isinstance(v, str) for k, v in env_vars.items()):
+        env.update(env_vars)
+    else:
+        env.update({str(k): str(v) for k, v in env_vars.items()})
+    
+    return env
 
 
 def execute_shell_script(
     script_path: Path,
     env_vars: dict[str, str],
     timeout: int | None = None,
+    binary: bool = False,
 ) -> subprocess.CompletedProcess:
     """
     Execute a shell script with environment variables.
     
+    Only the last MAX_TAIL_BYTES of stdout and of stderr are kept, so a
+    long-running, chatty script cannot exhaust memory.
+    
     Args:
         script_path: Path to script
         env_vars: Environment variables to pass
         timeout: Optional timeout in seconds
+        binary: Return stdout/stderr as raw bytes instead of decoding them
         
     Returns:
         CompletedProcess with stdout, stderr, returncode
     """
-    import os
+    env = _prepare_script(script_path, env_vars)
     
-    if not script_path.exists():
-        raise FileNotFoundError(f"Script not found: {script_path}")
+    # Execute; a non-zero exit code is returned, not raised
+    args = [str(script_path)]
+    returncode, stdout, stderr = _run_capture_tail(args, env, timeout)
     
-    # Make script executable
-    script_path.chmod(0o755)
+    return _completed(args, returncode, stdout, stderr, binary)
+
+
+async def execute_shell_script_async(
+    script_path: Path,
+    env_vars: dict[str, str],
+    timeout: float | None = None,
+    binary: bool = False,
+) -> subprocess.CompletedProcess:
+    """
+    Execute a shell script without blocking the event loop.
     
-    # Prepare environment
-    env = os.environ.copy()
-    env.update({str(k): str(v) for k, v in env_vars.items()})
-    
-    # Execute (check=False to capture errors without raising)
-    result = subprocess.run(
-        [str(script_path)],
-        capture_output=True,
-        text=True,
-        check=False,
+    Independent scripts can be run concurrently with asyncio.gather().
+    Like execute_shell_script, only the last MAX_TAIL_BYTES of each
+    stream are kept. On timeout or cancellation the script's whole
+    process group is killed, including the tool it is running.
+    
+    Args:
+        script_path: Path to script
+        env_vars: Environment variables to pass
+        timeout: Optional timeout in seconds
+        binary: Return stdout/stderr as raw bytes instead of decoding them
+        
+    Returns:
+        CompletedProcess with stdout, stderr (decoded as UTF-8), returncode
+        
+    Raises:
+        subprocess.TimeoutExpired: If the script outlives the timeout
+            (its process group is killed first)
+    """
+    env = _prepare_script(script_path, env_vars)
+    args = [str(script_path)]
+    
+    # The script gets its own process group: the tool it runs in the
+    # foreground inherits the pipes, and proc.wait() only returns once
+    # they close, so a timeout or cancel has to kill the whole group
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
         env=env,
-        timeout=timeout,
     )
+    stdout_tail = _OutputTail(MAX_TAIL_BYTES)
+    stderr_tail = _OutputTail(MAX_TAIL_BYTES)
+    
+    async def drain(stream: asyncio.StreamReader, tail: _OutputTail) -> None:
+        while chunk := await stream.read(65536):
+            tail.append(chunk)
+    
+    async def kill_group() -> None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+    
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                drain(proc.stdout, stdout_tail),
+                drain(proc.stderr, stderr_tail),
+                proc.wait(),
+            ),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        await kill_group()
+        raise subprocess.TimeoutExpired(
+            args,
+            timeout,
+            output=stdout_tail.value(),
+            stderr=stderr_tail.value(),
+        ) from None
+    except BaseException:
+        # Task cancelled or failed: never leave the script or its tools running
+        await kill_group()
+        raise
     
-    return result
\ No newline at end of file
+    return _completed(args, proc.returncode, stdout_tail.value(), stderr_tail.value(), binary)
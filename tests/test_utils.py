@@ -0,0 +1,59 @@
+"""
+Tests for iottrafficgen.utils
+"""
+import asyncio
+import subprocess
+import time
+
+import pytest
+
+from iottrafficgen.utils import execute_shell_script_async
+
+
+# The tool runs in the foreground and keeps stdout/stderr open after
+# bash itself is killed
+SLOW_SCRIPT = "#!/bin/bash\necho partial\nsleep 4\necho done\n"
+
+
+@pytest.fixture
+def slow_script(tmp_path):
+    script = tmp_path / "slow.sh"
+    script.write_text(SLOW_SCRIPT)
+    script.chmod(0o755)
+    return script
+
+
+def test_async_timeout_kills_foreground_tool(slow_script):
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+        asyncio.run(execute_shell_script_async(slow_script, {}, timeout=1))
+    elapsed = time.monotonic() - start
+    
+    assert elapsed < 2
+    assert excinfo.value.output == b"partial\n"
+
+
+def test_async_cancel_kills_foreground_tool(slow_script):
+    async def run_and_cancel():
+        task = asyncio.create_task(execute_shell_script_async(slow_script, {}))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    start = time.monotonic()
+    asyncio.run(run_and_cancel())
+    elapsed = time.monotonic() - start
+    
+    assert elapsed < 1.5
+
+
+def test_async_returns_output(tmp_path):
+    script = tmp_path / "ok.sh"
+    script.write_text('#!/bin/bash\necho "hi $NAME"\necho err >&2\nexit 3\n')
+    
+    result = asyncio.run(execute_shell_script_async(script, {"NAME": "x"}))
+    
+    assert result.returncode == 3
+    assert result.stdout == "hi x\n"
+    assert result.stderr == "err\n"